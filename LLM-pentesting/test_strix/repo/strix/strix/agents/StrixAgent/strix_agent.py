@@ -1,18 +1,72 @@
+from collections.abc import Callable
 from typing import Any
 
 from strix.agents.base_agent import BaseAgent
 from strix.llm.config import LLMConfig
 
 
+_WORKSPACE_PATH = "/workspace"
+
+_ROOT_AGENT_MODULES: tuple[str, ...] = ("root_agent",)
+_NO_MODULES: tuple[str, ...] = ()
+
+
+_REPOSITORY_CLONED_TASK = (
+    "Perform a security assessment of the Git repository: {target_repo}. "
+    "The repository has been cloned from '{target_repo}' to '{cloned_repo_path}' "
+    "(host path) and then copied to '{workspace_path}' in your environment."
+    "Analyze the codebase at: {workspace_path}"
+)
+_REPOSITORY_TASK = "Perform a security assessment of the Git repository: {target_repo}"
+_WEB_APPLICATION_TASK = "Perform a security assessment of the web application: {target_url}"
+_LOCAL_CODE_TASK = (
+    "Perform a security assessment of the local codebase. "
+    "The code from '{target_path}' (user host path) has been copied to "
+    "'{workspace_path}' in your environment. "
+    "Analyze the codebase at: {workspace_path}"
+)
+_GENERAL_TASK = "Perform a general security assessment of: {target}"
+
+
+def _build_repository_task(target: dict[str, Any]) -> str:
+    if target.get("cloned_repo_path"):
+        return _REPOSITORY_CLONED_TASK.format_map({**target, "workspace_path": _WORKSPACE_PATH})
+    return _REPOSITORY_TASK.format_map(target)
+
+
+def _build_web_application_task(target: dict[str, Any]) -> str:
+    return _WEB_APPLICATION_TASK.format_map(target)
+
+
+def _build_local_code_task(target: dict[str, Any]) -> str:
+    return _LOCAL_CODE_TASK.format_map(
+        {"target_path": target.get("target_path", "unknown"), "workspace_path": _WORKSPACE_PATH}
+    )
+
+
+def _build_general_task(target: dict[str, Any]) -> str:
+    target_value = (
+        target.get("target_url") or target.get("target_path") or target.get("target_repo")
+    )
+    if not target_value:
+        raise ValueError("Scan target must set target_url, target_path or target_repo")
+    return _GENERAL_TASK.format_map({"target": target_value})
+
+
+_SCAN_TASK_BUILDERS: dict[str, Callable[[dict[str, Any]], str]] = {
+    "repository": _build_repository_task,
+    "web_application": _build_web_application_task,
+    "local_code": _build_local_code_task,
+}
+
+
 class StrixAgent(BaseAgent):
     max_iterations = 200
 
     def __init__(self, config: dict[str, Any]):
-        default_modules = []
-
         state = config.get("state")
-        if state is None or (hasattr(state, "parent_id") and state.parent_id is None):
-            default_modules = ["root_agent"]
+        is_root = state is None or state.parent_id is None
+        default_modules = _ROOT_AGENT_MODULES if is_root else _NO_MODULES
 
         self.default_llm_config = LLMConfig(prompt_modules=default_modules)
 
@@ -23,46 +77,8 @@ class StrixAgent(BaseAgent):
         target = scan_config.get("target", {})
         user_instructions = scan_config.get("user_instructions", "")
 
-        task_parts = []
-
-        if scan_type == "repository":
-            repo_url = target["target_repo"]
-            cloned_path = target.get("cloned_repo_path")
-
-            if cloned_path:
-                workspace_path = "/workspace"
-                task_parts.append(
-                    f"Perform a security assessment of the Git repository: {repo_url}. "
-                    f"The repository has been cloned from '{repo_url}' to '{cloned_path}' "
-                    f"(host path) and then copied to '{workspace_path}' in your environment."
-                    f"Analyze the codebase at: {workspace_path}"
-                )
-            else:
-                task_parts.append(
-                    f"Perform a security assessment of the Git repository: {repo_url}"
-                )
-
-        elif scan_type == "web_application":
-            task_parts.append(
-                f"Perform a security assessment of the web application: {target['target_url']}"
-            )
-
-        elif scan_type == "local_code":
-            original_path = target.get("target_path", "unknown")
-            workspace_path = "/workspace"
-            task_parts.append(
-                f"Perform a security assessment of the local codebase. "
-                f"The code from '{original_path}' (user host path) has been copied to "
-                f"'{workspace_path}' in your environment. "
-                f"Analyze the codebase at: {workspace_path}"
-            )
-
-        else:
-            task_parts.append(
-                f"Perform a general security assessment of: {next(iter(target.values()))}"
-            )
-
-        task_description = " ".join(task_parts)
+        builder = _SCAN_TASK_BUILDERS.get(scan_type, _build_general_task)
+        task_description = builder(target)
 
         if user_instructions:
             task_description += (
@@ -1,9 +1,10 @@
 from .base_agent import BaseAgent
-from .state import AgentState
+from .state import AgentIdentity, AgentState
 from .StrixAgent import StrixAgent
 
 
 __all__ = [
+    "AgentIdentity",
     "AgentState",
     "BaseAgent",
     "StrixAgent",
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -17,7 +18,7 @@ from strix.llm import LLM, LLMConfig, LLMRequestFailedError
 from strix.llm.utils import clean_content
 from strix.tools import process_tool_invocations
 
-from .state import AgentState
+from .state import AgentIdentity, AgentState
 
 
 logger = logging.getLogger(__name__)
@@ -70,8 +71,10 @@ class BaseAgent(metaclass=AgentMeta):
             self.state = state_from_config
         else:
             self.state = AgentState(
-                agent_name=self.agent_name,
-                max_iterations=self.max_iterations,
+                identity=AgentIdentity(
+                    agent_name=self.agent_name,
+                    max_iterations=self.max_iterations,
+                )
             )
 
         self._current_task: asyncio.Task[Any] | None = None
@@ -118,12 +121,12 @@ class BaseAgent(metaclass=AgentMeta):
             "task": self.state.task,
             "status": "running",
             "parent_id": self.state.parent_id,
-            "created_at": self.state.start_time,
+            "created_at": self.state.start_time_iso,
             "finished_at": None,
             "result": None,
             "llm_config": self.llm_config_name,
             "agent_type": self.__class__.__name__,
-            "state": self.state.model_dump(),
+            "state": self.state.to_dict(),
         }
         agents_graph_actions._agent_graph["nodes"][self.state.agent_id] = node
 
@@ -309,8 +312,9 @@ class BaseAgent(metaclass=AgentMeta):
 
     async def _execute_actions(self, actions: list[Any], tracer: Optional["Tracer"]) -> bool:
         """Execute actions and return True if agent should finish."""
+        timestamp = time.time_ns()
         for action in actions:
-            self.state.add_action(action)
+            self.state.add_action(action, timestamp=timestamp)
 
         conversation_history = self.state.get_conversation_history()
 
@@ -1,84 +1,216 @@
-import uuid
+import copy
+import json
+import secrets
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field, fields
 from datetime import UTC, datetime
+from itertools import chain
 from typing import Any
 
-from pydantic import BaseModel, Field
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with litellm[proxy]
+    _JSON_ENCODER = json.JSONEncoder(default=str, ensure_ascii=False, separators=(",", ":"))
+
+    def _encode_json(obj: Any) -> bytes:
+        return _JSON_ENCODER.encode(obj).encode()
+else:
+
+    def _encode_json(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+_CHUNK_SIZE = 64
 
 
 def _generate_agent_id() -> str:
-    return f"agent_{uuid.uuid4().hex[:8]}"
+    return f"agent_{secrets.token_hex(4)}"
+
+
+def _ns_to_iso(timestamp_ns: int) -> str:
+    return datetime.fromtimestamp(timestamp_ns / 1e9, UTC).isoformat()
+
+
+class _ChunkedList[T]:
+    __slots__ = ("_chunks",)
+
+    def __init__(self) -> None:
+        self._chunks: list[list[T]] = [[]]
+
+    def append(self, item: T) -> None:
+        tail = self._chunks[-1]
+        if len(tail) >= _CHUNK_SIZE:
+            tail = []
+            self._chunks.append(tail)
+        tail.append(item)
+
+    def __len__(self) -> int:
+        return (len(self._chunks) - 1) * _CHUNK_SIZE + len(self._chunks[-1])
+
+    def __iter__(self) -> Iterator[T]:
+        return chain.from_iterable(self._chunks)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _ChunkedList):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None  # type: ignore[assignment]
 
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
 
-class AgentState(BaseModel):
-    agent_id: str = Field(default_factory=_generate_agent_id)
+
+@dataclass(slots=True)
+class ActionRecord:
+    iteration: int
+    timestamp: int
+    action: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "iteration": self.iteration,
+            "timestamp": _ns_to_iso(self.timestamp),
+            "action": self.action,
+        }
+
+
+@dataclass(slots=True)
+class ObservationRecord:
+    iteration: int
+    timestamp: int
+    observation: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "iteration": self.iteration,
+            "timestamp": _ns_to_iso(self.timestamp),
+            "observation": self.observation,
+        }
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AgentIdentity:
+    agent_id: str = field(default_factory=_generate_agent_id)
     agent_name: str = "Strix Agent"
     parent_id: str | None = None
+    max_iterations: int = 200
+    start_time: int = field(default_factory=time.time_ns)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "agent_id": self.agent_id,
+            "agent_name": self.agent_name,
+            "parent_id": self.parent_id,
+            "max_iterations": self.max_iterations,
+            "start_time": _ns_to_iso(self.start_time),
+        }
+
+
+@dataclass(slots=True, kw_only=True)
+class AgentState:
+    identity: AgentIdentity = field(default_factory=AgentIdentity)
+
     sandbox_id: str | None = None
     sandbox_token: str | None = None
     sandbox_info: dict[str, Any] | None = None
 
     task: str = ""
     iteration: int = 0
-    max_iterations: int = 200
     completed: bool = False
     stop_requested: bool = False
     waiting_for_input: bool = False
     llm_failed: bool = False
     final_result: dict[str, Any] | None = None
 
-    messages: list[dict[str, Any]] = Field(default_factory=list)
-    context: dict[str, Any] = Field(default_factory=dict)
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    context: dict[str, Any] = field(default_factory=dict)
+
+    last_updated: int = field(default_factory=time.time_ns)
+
+    actions_taken: _ChunkedList[ActionRecord] = field(default_factory=_ChunkedList)
+    observations: _ChunkedList[ObservationRecord] = field(default_factory=_ChunkedList)
+
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _cached_summary: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def agent_id(self) -> str:
+        return self.identity.agent_id
 
-    start_time: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
-    last_updated: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
+    @property
+    def agent_name(self) -> str:
+        return self.identity.agent_name
 
-    actions_taken: list[dict[str, Any]] = Field(default_factory=list)
-    observations: list[dict[str, Any]] = Field(default_factory=list)
+    @property
+    def parent_id(self) -> str | None:
+        return self.identity.parent_id
 
-    errors: list[str] = Field(default_factory=list)
+    @property
+    def max_iterations(self) -> int:
+        return self.identity.max_iterations
+
+    @property
+    def start_time(self) -> int:
+        return self.identity.start_time
+
+    @property
+    def start_time_iso(self) -> str:
+        return _ns_to_iso(self.identity.start_time)
+
+    @property
+    def last_updated_iso(self) -> str:
+        return _ns_to_iso(self.last_updated)
+
+    def _mark_updated(self, timestamp: int | None = None) -> None:
+        self.last_updated = time.time_ns() if timestamp is None else timestamp
+        self._version += 1
+        self._cached_summary = None
 
     def increment_iteration(self) -> None:
         self.iteration += 1
-        self.last_updated = datetime.now(UTC).isoformat()
+        self._mark_updated()
 
     def add_message(self, role: str, content: Any) -> None:
         self.messages.append({"role": role, "content": content})
-        self.last_updated = datetime.now(UTC).isoformat()
-
-    def add_action(self, action: dict[str, Any]) -> None:
-        self.actions_taken.append(
-            {
-                "iteration": self.iteration,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "action": action,
-            }
-        )
-
-    def add_observation(self, observation: dict[str, Any]) -> None:
-        self.observations.append(
-            {
-                "iteration": self.iteration,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "observation": observation,
-            }
-        )
+        self._mark_updated()
+
+    def add_action(self, action: dict[str, Any], timestamp: int | None = None) -> None:
+        ts = time.time_ns() if timestamp is None else timestamp
+        self.actions_taken.append(ActionRecord(self.iteration, ts, action))
+        self._mark_updated(ts)
+
+    def add_observation(self, observation: dict[str, Any], timestamp: int | None = None) -> None:
+        ts = time.time_ns() if timestamp is None else timestamp
+        self.observations.append(ObservationRecord(self.iteration, ts, observation))
+        self._mark_updated(ts)
 
     def add_error(self, error: str) -> None:
-        self.errors.append(f"Iteration {self.iteration}: {error}")
-        self.last_updated = datetime.now(UTC).isoformat()
+        self.errors.append((self.iteration, error))
+        self._mark_updated()
 
     def update_context(self, key: str, value: Any) -> None:
         self.context[key] = value
-        self.last_updated = datetime.now(UTC).isoformat()
+        self._mark_updated()
 
     def set_completed(self, final_result: dict[str, Any] | None = None) -> None:
+        if self.completed and self.final_result == final_result:
+            return
         self.completed = True
         self.final_result = final_result
-        self.last_updated = datetime.now(UTC).isoformat()
+        self._mark_updated()
 
     def request_stop(self) -> None:
+        if self.stop_requested:
+            return
         self.stop_requested = True
-        self.last_updated = datetime.now(UTC).isoformat()
+        self._mark_updated()
 
     def should_stop(self) -> bool:
         return self.stop_requested or self.completed or self.has_reached_max_iterations()
@@ -87,31 +219,37 @@ class AgentState(BaseModel):
         return self.waiting_for_input
 
     def enter_waiting_state(self, llm_failed: bool = False) -> None:
+        if self.waiting_for_input and not self.stop_requested and self.llm_failed == llm_failed:
+            return
         self.waiting_for_input = True
         self.stop_requested = False
         self.llm_failed = llm_failed
-        self.last_updated = datetime.now(UTC).isoformat()
+        self._mark_updated()
 
     def resume_from_waiting(self, new_task: str | None = None) -> None:
+        if not (
+            self.waiting_for_input or self.stop_requested or self.completed or self.llm_failed
+        ) and (not new_task or new_task == self.task):
+            return
         self.waiting_for_input = False
         self.stop_requested = False
         self.completed = False
         self.llm_failed = False
         if new_task:
             self.task = new_task
-        self.last_updated = datetime.now(UTC).isoformat()
+        self._mark_updated()
 
     def has_reached_max_iterations(self) -> bool:
         return self.iteration >= self.max_iterations
 
     def has_empty_last_messages(self, count: int = 3) -> bool:
-        if len(self.messages) < count:
+        messages = self.messages
+        total = len(messages)
+        if total < count:
             return False
 
-        last_messages = self.messages[-count:]
-
-        for message in last_messages:
-            content = message.get("content", "")
+        for index in range(total - 1, total - count - 1, -1):
+            content = messages[index].get("content", "")
             if isinstance(content, str) and content.strip():
                 return False
 
@@ -120,7 +258,30 @@ class AgentState(BaseModel):
     def get_conversation_history(self) -> list[dict[str, Any]]:
         return self.messages
 
+    def formatted_errors(self) -> list[str]:
+        return [f"Iteration {iteration}: {error}" for iteration, error in self.errors]
+
+    def _snapshot(self) -> dict[str, Any]:
+        data = self.identity.to_dict()
+        data.update((name, getattr(self, name)) for name in _SNAPSHOT_FIELDS)
+        data["last_updated"] = self.last_updated_iso
+        data["actions_taken"] = [record.to_dict() for record in self.actions_taken]
+        data["observations"] = [record.to_dict() for record in self.observations]
+        data["errors"] = self.formatted_errors()
+        return data
+
+    def to_dict(self) -> dict[str, Any]:
+        return copy.deepcopy(self._snapshot())
+
+    def to_json(self) -> bytes:
+        return _encode_json(self._snapshot())
+
     def get_execution_summary(self) -> dict[str, Any]:
+        if self._cached_summary is None:
+            self._cached_summary = self._build_execution_summary()
+        return dict(self._cached_summary)
+
+    def _build_execution_summary(self) -> dict[str, Any]:
         return {
             "agent_id": self.agent_id,
             "agent_name": self.agent_name,
@@ -132,11 +293,16 @@ class AgentState(BaseModel):
             "max_iterations": self.max_iterations,
             "completed": self.completed,
             "final_result": self.final_result,
-            "start_time": self.start_time,
-            "last_updated": self.last_updated,
+            "start_time": self.start_time_iso,
+            "last_updated": self.last_updated_iso,
             "total_actions": len(self.actions_taken),
             "total_observations": len(self.observations),
             "total_errors": len(self.errors),
             "has_errors": len(self.errors) > 0,
             "max_iterations_reached": self.has_reached_max_iterations() and not self.completed,
         }
+
+
+_SNAPSHOT_FIELDS = tuple(
+    f.name for f in fields(AgentState) if f.name != "identity" and not f.name.startswith("_")
+)
@@ -234,8 +234,8 @@ class StrixCLIApp(App):  # type: ignore[misc]
     def _build_scan_config(self, args: argparse.Namespace) -> dict[str, Any]:
         return {
             "scan_id": args.run_name,
-            "scan_type": args.target_type,
-            "target": args.target_dict,
+            "scan_type": args.target_obj.kind,
+            "target": args.target_obj.to_scan_target(),
             "user_instructions": args.instruction or "",
             "run_name": args.run_name,
         }
@@ -248,10 +248,9 @@ class StrixCLIApp(App):  # type: ignore[misc]
             "max_iterations": 200,
         }
 
-        if args.target_type == "local_code" and "target_path" in args.target_dict:
-            config["local_source_path"] = args.target_dict["target_path"]
-        elif args.target_type == "repository" and "cloned_repo_path" in args.target_dict:
-            config["local_source_path"] = args.target_dict["cloned_repo_path"]
+        local_source_path = args.target_obj.local_source_path
+        if local_source_path:
+            config["local_source_path"] = local_source_path
 
         return config
 
@@ -5,30 +5,58 @@ Strix Agent Command Line Interface
 
 import argparse
 import asyncio
+import functools
 import logging
 import os
-import secrets
+import random
+import re
 import shutil
+import stat
 import subprocess
 import sys
 import tempfile
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal
 from urllib.parse import urlparse
 
-import docker
-import litellm
-from docker.errors import DockerException
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
 
-from strix.cli.app import run_strix_cli
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.text import Text
+
 from strix.cli.tracer import get_global_tracer
-from strix.runtime.docker_runtime import STRIX_IMAGE
 
 
-logging.getLogger().setLevel(logging.ERROR)
+_API_BASE_ENV_VARS = ("LLM_API_BASE", "OPENAI_API_BASE", "LITELLM_BASE_URL", "OLLAMA_API_BASE")
+_ENV_VARS = (
+    "STRIX_LLM",
+    "LLM_API_KEY",
+    "PERPLEXITY_API_KEY",
+    "STRIX_SKIP_DOCKER_PULL",
+    *_API_BASE_ENV_VARS,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _env_snapshot() -> dict[str, str | None]:
+    return {name: os.environ.get(name) for name in _ENV_VARS}
+
+
+def _api_base(env: dict[str, str | None]) -> str | None:
+    for name in _API_BASE_ENV_VARS:
+        if env[name]:
+            return env[name]
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _console() -> "Console":
+    from rich.console import Console
+
+    return Console()
 
 
 def format_token_count(count: float) -> str:
@@ -40,24 +68,84 @@ def format_token_count(count: float) -> str:
     return str(count)
 
 
-def validate_environment() -> None:  # noqa: PLR0912, PLR0915
-    console = Console()
+_REQUIRED_ENV_VAR_META: dict[str, tuple[str, str]] = {
+    "STRIX_LLM": (
+        "Model name to use with litellm (e.g., 'openai/gpt-5')",
+        "export STRIX_LLM='openai/gpt-5'",
+    ),
+    "LLM_API_KEY": (
+        "API key for the LLM provider (required for cloud providers)",
+        "export LLM_API_KEY='your-api-key-here'",
+    ),
+}
+
+_OPTIONAL_ENV_VAR_META: dict[str, tuple[str, str]] = {
+    "LLM_API_KEY": (
+        "API key for the LLM provider",
+        "export LLM_API_KEY='your-api-key-here'  # optional with local models",
+    ),
+    "LLM_API_BASE": (
+        "Custom API base URL if using local models (e.g., Ollama, LMStudio)",
+        "export LLM_API_BASE='http://localhost:11434'  # needed for local models only",
+    ),
+    "PERPLEXITY_API_KEY": (
+        "API key for Perplexity AI web search (enables real-time research)",
+        "export PERPLEXITY_API_KEY='your-perplexity-key-here'",
+    ),
+}
+
+
+def _print_error_panel(title: str, headline: str, body: Iterable[tuple[str, str]]) -> None:
+    from rich.panel import Panel
+    from rich.text import Text
+
+    error_text = Text()
+    error_text.append("❌ ", style="bold red")
+    error_text.append(headline, style="bold red")
+    error_text.append("\n\n", style="white")
+    for text, style in body:
+        error_text.append(text, style=style)
+
+    panel = Panel(
+        error_text,
+        title=f"[bold red]🛡️  {title}",
+        title_align="center",
+        border_style="red",
+        padding=(1, 2),
+    )
+
+    console = _console()
+    console.print("\n")
+    console.print(panel)
+    console.print()
+
+
+class _StartupError(Exception):
+    def __init__(self, title: str, headline: str, body: Iterable[tuple[str, str]]):
+        super().__init__(headline)
+        self.title = title
+        self.headline = headline
+        self.body = body
+
+    def print_panel(self) -> None:
+        _print_error_panel(self.title, self.headline, self.body)
+
+
+def _env_var_description(var: str, description: str) -> list[tuple[str, str]]:
+    return [("• ", "white"), (var, "bold cyan"), (f" - {description}\n", "white")]
+
+
+def validate_environment() -> None:
+    env = _env_snapshot()
     missing_required_vars = []
     missing_optional_vars = []
 
-    if not os.getenv("STRIX_LLM"):
+    if not env["STRIX_LLM"]:
         missing_required_vars.append("STRIX_LLM")
 
-    has_base_url = any(
-        [
-            os.getenv("LLM_API_BASE"),
-            os.getenv("OPENAI_API_BASE"),
-            os.getenv("LITELLM_BASE_URL"),
-            os.getenv("OLLAMA_API_BASE"),
-        ]
-    )
+    has_base_url = _api_base(env) is not None
 
-    if not os.getenv("LLM_API_KEY"):
+    if not env["LLM_API_KEY"]:
         if not has_base_url:
             missing_required_vars.append("LLM_API_KEY")
         else:
@@ -66,146 +154,138 @@ def validate_environment() -> None:  # noqa: PLR0912, PLR0915
     if not has_base_url:
         missing_optional_vars.append("LLM_API_BASE")
 
-    if not os.getenv("PERPLEXITY_API_KEY"):
+    if not env["PERPLEXITY_API_KEY"]:
         missing_optional_vars.append("PERPLEXITY_API_KEY")
 
     if missing_required_vars:
-        error_text = Text()
-        error_text.append("❌ ", style="bold red")
-        error_text.append("MISSING REQUIRED ENVIRONMENT VARIABLES", style="bold red")
-        error_text.append("\n\n", style="white")
+        body: list[tuple[str, str]] = []
 
         for var in missing_required_vars:
-            error_text.append(f"• {var}", style="bold yellow")
-            error_text.append(" is not set\n", style="white")
-
-        if missing_optional_vars:
-            error_text.append("\nOptional environment variables:\n", style="dim white")
-            for var in missing_optional_vars:
-                error_text.append(f"• {var}", style="dim yellow")
-                error_text.append(" is not set\n", style="dim white")
+            body.extend(((f"• {var}", "bold yellow"), (" is not set\n", "white")))
 
-        error_text.append("\nRequired environment variables:\n", style="white")
+        body.append(("\nRequired environment variables:\n", "white"))
         for var in missing_required_vars:
-            if var == "STRIX_LLM":
-                error_text.append("• ", style="white")
-                error_text.append("STRIX_LLM", style="bold cyan")
-                error_text.append(
-                    " - Model name to use with litellm (e.g., 'openai/gpt-5')\n",
-                    style="white",
-                )
-            elif var == "LLM_API_KEY":
-                error_text.append("• ", style="white")
-                error_text.append("LLM_API_KEY", style="bold cyan")
-                error_text.append(
-                    " - API key for the LLM provider (required for cloud providers)\n",
-                    style="white",
-                )
+            body.extend(_env_var_description(var, _REQUIRED_ENV_VAR_META[var][0]))
 
         if missing_optional_vars:
-            error_text.append("\nOptional environment variables:\n", style="white")
+            body.append(("\nOptional environment variables:\n", "white"))
             for var in missing_optional_vars:
-                if var == "LLM_API_KEY":
-                    error_text.append("• ", style="white")
-                    error_text.append("LLM_API_KEY", style="bold cyan")
-                    error_text.append(" - API key for the LLM provider\n", style="white")
-                elif var == "LLM_API_BASE":
-                    error_text.append("• ", style="white")
-                    error_text.append("LLM_API_BASE", style="bold cyan")
-                    error_text.append(
-                        " - Custom API base URL if using local models (e.g., Ollama, LMStudio)\n",
-                        style="white",
-                    )
-                elif var == "PERPLEXITY_API_KEY":
-                    error_text.append("• ", style="white")
-                    error_text.append("PERPLEXITY_API_KEY", style="bold cyan")
-                    error_text.append(
-                        " - API key for Perplexity AI web search (enables real-time research)\n",
-                        style="white",
-                    )
-
-        error_text.append("\nExample setup:\n", style="white")
-        error_text.append("export STRIX_LLM='openai/gpt-5'\n", style="dim white")
-
-        if "LLM_API_KEY" in missing_required_vars:
-            error_text.append("export LLM_API_KEY='your-api-key-here'\n", style="dim white")
+                body.extend(_env_var_description(var, _OPTIONAL_ENV_VAR_META[var][0]))
 
-        if missing_optional_vars:
-            for var in missing_optional_vars:
-                if var == "LLM_API_KEY":
-                    error_text.append(
-                        "export LLM_API_KEY='your-api-key-here'  # optional with local models\n",
-                        style="dim white",
-                    )
-                elif var == "LLM_API_BASE":
-                    error_text.append(
-                        "export LLM_API_BASE='http://localhost:11434'  "
-                        "# needed for local models only\n",
-                        style="dim white",
-                    )
-                elif var == "PERPLEXITY_API_KEY":
-                    error_text.append(
-                        "export PERPLEXITY_API_KEY='your-perplexity-key-here'\n", style="dim white"
-                    )
-
-        panel = Panel(
-            error_text,
-            title="[bold red]🛡️  STRIX CONFIGURATION ERROR",
-            title_align="center",
-            border_style="red",
-            padding=(1, 2),
+        examples = [_REQUIRED_ENV_VAR_META["STRIX_LLM"][1]]
+        examples.extend(
+            _REQUIRED_ENV_VAR_META[var][1] for var in missing_required_vars if var != "STRIX_LLM"
         )
+        examples.extend(_OPTIONAL_ENV_VAR_META[var][1] for var in missing_optional_vars)
+        body.append(("\nExample setup:\n", "white"))
+        body.append(("\n".join(examples) + "\n", "dim white"))
 
-        console.print("\n")
-        console.print(panel)
-        console.print()
+        _print_error_panel(
+            "STRIX CONFIGURATION ERROR", "MISSING REQUIRED ENVIRONMENT VARIABLES", body
+        )
         sys.exit(1)
 
 
+_REASONING_WARM_UP_MAX_TOKENS = 2048
+
+
+def _warm_up_limits(model_name: str) -> dict[str, Any]:
+    from litellm.utils import supports_reasoning
+
+    from strix.llm.llm import MODELS_WITHOUT_STOP_WORDS, REASONING_EFFORT_SUPPORTED_MODELS
+
+    actual_model_name = model_name.lower().rsplit("/", 1)[-1]
+    if actual_model_name in REASONING_EFFORT_SUPPORTED_MODELS:
+        return {"max_completion_tokens": _REASONING_WARM_UP_MAX_TOKENS, "reasoning_effort": "low"}
+    if actual_model_name in MODELS_WITHOUT_STOP_WORDS or supports_reasoning(model_name):
+        return {"max_completion_tokens": _REASONING_WARM_UP_MAX_TOKENS}
+    return {"max_tokens": 4, "temperature": 0}
+
+
+async def _completion_with_backoff(model_name: str, messages: list[dict[str, str]]) -> Any:
+    import litellm
+    from tenacity import (
+        AsyncRetrying,
+        retry_if_exception_type,
+        stop_after_attempt,
+        wait_random_exponential,
+    )
+
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=2, max=60),
+        retry=retry_if_exception_type(
+            (
+                litellm.RateLimitError,
+                litellm.ServiceUnavailableError,
+                litellm.APIConnectionError,
+                litellm.Timeout,
+            )
+        ),
+        reraise=True,
+    ):
+        with attempt:
+            return await litellm.acompletion(
+                model=model_name,
+                messages=messages,
+                timeout=20,
+                num_retries=0,
+                **_warm_up_limits(model_name),
+            )
+
+    raise RuntimeError("Unreachable code")
+
+
 def _validate_llm_response(response: Any) -> None:
     if not response or not response.choices or not response.choices[0].message.content:
         raise RuntimeError("Invalid response from LLM")
 
 
+@functools.lru_cache(maxsize=8)
+def _which(cmd: str) -> str | None:
+    return shutil.which(cmd)
+
+
+_GIT_NOT_FOUND_BODY = (
+    ("Git is not installed or not available in PATH.\n", "white"),
+    ("Please install Git to clone repositories.\n", "white"),
+)
+
+
 def check_docker_installed() -> None:
-    if shutil.which("docker") is None:
-        console = Console()
-        error_text = Text()
-        error_text.append("❌ ", style="bold red")
-        error_text.append("DOCKER NOT INSTALLED", style="bold red")
-        error_text.append("\n\n", style="white")
-        error_text.append("The 'docker' CLI was not found in your PATH.\n", style="white")
-        error_text.append(
-            "Please install Docker and ensure the 'docker' command is available.\n\n", style="white"
+    if _which("docker") is None:
+        _print_error_panel(
+            "STRIX STARTUP ERROR",
+            "DOCKER NOT INSTALLED",
+            [
+                ("The 'docker' CLI was not found in your PATH.\n", "white"),
+                (
+                    "Please install Docker and ensure the 'docker' command is available.\n\n",
+                    "white",
+                ),
+            ],
         )
+        sys.exit(1)
 
-        panel = Panel(
-            error_text,
-            title="[bold red]🛡️  STRIX STARTUP ERROR",
-            title_align="center",
-            border_style="red",
-            padding=(1, 2),
-        )
-        console.print("\n", panel, "\n")
+
+def check_git_installed() -> None:
+    if _which("git") is None:
+        _print_error_panel("STRIX CLONE ERROR", "GIT NOT FOUND", _GIT_NOT_FOUND_BODY)
         sys.exit(1)
 
 
 async def warm_up_llm() -> None:
-    console = Console()
+    import litellm
 
     try:
-        model_name = os.getenv("STRIX_LLM", "openai/gpt-5")
-        api_key = os.getenv("LLM_API_KEY")
+        env = _env_snapshot()
+        model_name = env["STRIX_LLM"] or "openai/gpt-5"
+        api_key = env["LLM_API_KEY"]
 
         if api_key:
             litellm.api_key = api_key
 
-        api_base = (
-            os.getenv("LLM_API_BASE")
-            or os.getenv("OPENAI_API_BASE")
-            or os.getenv("LITELLM_BASE_URL")
-            or os.getenv("OLLAMA_API_BASE")
-        )
+        api_base = _api_base(env)
         if api_base:
             litellm.api_base = api_base
 
@@ -214,59 +294,52 @@ async def warm_up_llm() -> None:
             {"role": "user", "content": "Reply with just 'OK'."},
         ]
 
-        response = litellm.completion(
-            model=model_name,
-            messages=test_messages,
-        )
+        response = await _completion_with_backoff(model_name, test_messages)
 
         _validate_llm_response(response)
 
-    except Exception as e:  # noqa: BLE001
-        error_text = Text()
-        error_text.append("❌ ", style="bold red")
-        error_text.append("LLM CONNECTION FAILED", style="bold red")
-        error_text.append("\n\n", style="white")
-        error_text.append("Could not establish connection to the language model.\n", style="white")
-        error_text.append("Please check your configuration and try again.\n", style="white")
-        error_text.append(f"\nError: {e}", style="dim white")
-
-        panel = Panel(
-            error_text,
-            title="[bold red]🛡️  STRIX STARTUP ERROR",
-            title_align="center",
-            border_style="red",
-            padding=(1, 2),
-        )
-
-        console.print("\n")
-        console.print(panel)
-        console.print()
-        sys.exit(1)
+    except Exception as e:
+        raise _StartupError(
+            "STRIX STARTUP ERROR",
+            "LLM CONNECTION FAILED",
+            [
+                ("Could not establish connection to the language model.\n", "white"),
+                ("Please check your configuration and try again.\n", "white"),
+                (f"\nError: {e}", "dim white"),
+            ],
+        ) from e
+
+
+# fmt: off
+_RUN_NAME_ADJECTIVES: tuple[str, ...] = (
+    "stealthy", "sneaky", "crafty", "elite", "phantom", "shadow", "silent",
+    "rogue", "covert", "ninja", "ghost", "cyber", "digital", "binary",
+    "encrypted", "obfuscated", "masked", "cloaked", "invisible", "anonymous",
+)
+_RUN_NAME_NOUNS: tuple[str, ...] = (
+    "exploit", "payload", "backdoor", "rootkit", "keylogger", "botnet", "trojan",
+    "worm", "virus", "packet", "buffer", "shell", "daemon", "spider", "crawler",
+    "scanner", "sniffer", "honeypot", "firewall", "breach",
+)
+# fmt: on
+
+_RUN_NAME_RANDOM = random.SystemRandom()
+
+_SHALLOW_CLONE_ARGS = ("--depth=1", "--single-branch", "--filter=blob:none")
+_CLONE_TIMEOUT = 300
 
 
 def generate_run_name() -> str:
-    # fmt: off
-    adjectives = [
-        "stealthy", "sneaky", "crafty", "elite", "phantom", "shadow", "silent",
-        "rogue", "covert", "ninja", "ghost", "cyber", "digital", "binary",
-        "encrypted", "obfuscated", "masked", "cloaked", "invisible", "anonymous"
-    ]
-    nouns = [
-        "exploit", "payload", "backdoor", "rootkit", "keylogger", "botnet", "trojan",
-        "worm", "virus", "packet", "buffer", "shell", "daemon", "spider", "crawler",
-        "scanner", "sniffer", "honeypot", "firewall", "breach"
-    ]
-    # fmt: on
-    adj = secrets.choice(adjectives)
-    noun = secrets.choice(nouns)
-    number = secrets.randbelow(900) + 100
+    adj = _RUN_NAME_RANDOM.choice(_RUN_NAME_ADJECTIVES)
+    noun = _RUN_NAME_RANDOM.choice(_RUN_NAME_NOUNS)
+    number = _RUN_NAME_RANDOM.randint(100, 999)
     return f"{adj}-{noun}-{number}"
 
 
-def clone_repository(repo_url: str, run_name: str) -> str:
-    console = Console()
+def clone_repository(repo_url: str, run_name: str, full_clone: bool = False) -> str:
+    console = _console()
 
-    git_executable = shutil.which("git")
+    git_executable = _which("git")
     if git_executable is None:
         raise FileNotFoundError("Git executable not found in PATH")
 
@@ -280,65 +353,102 @@ def clone_repository(repo_url: str, run_name: str) -> str:
     if clone_path.exists():
         shutil.rmtree(clone_path)
 
+    clone_args = () if full_clone else _SHALLOW_CLONE_ARGS
+
     try:
         with console.status(f"[bold cyan]Cloning repository {repo_name}...", spinner="dots"):
             subprocess.run(  # noqa: S603
                 [
                     git_executable,
                     "clone",
+                    *clone_args,
                     repo_url,
                     str(clone_path),
                 ],
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 check=True,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+                timeout=_CLONE_TIMEOUT,
             )
 
         return str(clone_path.absolute())
 
     except subprocess.CalledProcessError as e:
-        error_text = Text()
-        error_text.append("❌ ", style="bold red")
-        error_text.append("REPOSITORY CLONE FAILED", style="bold red")
-        error_text.append("\n\n", style="white")
-        error_text.append(f"Could not clone repository: {repo_url}\n", style="white")
-        error_text.append(
-            f"Error: {e.stderr if hasattr(e, 'stderr') and e.stderr else str(e)}", style="dim red"
+        error = e.stderr.decode("utf-8", errors="replace") if e.stderr else str(e)
+        _print_error_panel(
+            "STRIX CLONE ERROR",
+            "REPOSITORY CLONE FAILED",
+            [
+                (f"Could not clone repository: {repo_url}\n", "white"),
+                (f"Error: {error}", "dim red"),
+            ],
         )
-
-        panel = Panel(
-            error_text,
-            title="[bold red]🛡️  STRIX CLONE ERROR",
-            title_align="center",
-            border_style="red",
-            padding=(1, 2),
+        sys.exit(1)
+    except subprocess.TimeoutExpired:
+        _print_error_panel(
+            "STRIX CLONE ERROR",
+            "REPOSITORY CLONE TIMED OUT",
+            [
+                (f"Could not clone repository: {repo_url}\n", "white"),
+                (f"Error: git clone did not finish within {_CLONE_TIMEOUT} seconds", "dim red"),
+            ],
         )
-        console.print("\n")
-        console.print(panel)
-        console.print()
         sys.exit(1)
     except FileNotFoundError:
-        error_text = Text()
-        error_text.append("❌ ", style="bold red")
-        error_text.append("GIT NOT FOUND", style="bold red")
-        error_text.append("\n\n", style="white")
-        error_text.append("Git is not installed or not available in PATH.\n", style="white")
-        error_text.append("Please install Git to clone repositories.\n", style="white")
-
-        panel = Panel(
-            error_text,
-            title="[bold red]🛡️  STRIX CLONE ERROR",
-            title_align="center",
-            border_style="red",
-            padding=(1, 2),
-        )
-        console.print("\n")
-        console.print(panel)
-        console.print()
+        _print_error_panel("STRIX CLONE ERROR", "GIT NOT FOUND", _GIT_NOT_FOUND_BODY)
         sys.exit(1)
 
 
-def infer_target_type(target: str) -> tuple[str, dict[str, str]]:
+_TARGET_KEYS = {
+    "repository": "target_repo",
+    "web_application": "target_url",
+    "local_code": "target_path",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Target:
+    kind: Literal["repository", "web_application", "local_code"]
+    value: str
+    cloned_repo_path: str | None = None
+
+    @property
+    def local_source_path(self) -> str | None:
+        if self.kind == "local_code":
+            return self.value
+        return self.cloned_repo_path
+
+    def to_scan_target(self) -> dict[str, str]:
+        target = {_TARGET_KEYS[self.kind]: self.value}
+        if self.cloned_repo_path:
+            target["cloned_repo_path"] = self.cloned_repo_path
+        return target
+
+
+_GIT_HOSTS = frozenset({"github.com", "gitlab.com", "bitbucket.org"})
+_DOMAIN_RE = re.compile(r"^(?=.{1,253}(?::\d+)?$)[a-z0-9_-]+(?:\.[a-z0-9_-]+)+(?::\d{1,5})?$", re.I)
+
+
+def _is_git_host(hostname: str | None) -> bool:
+    if not hostname:
+        return False
+    if hostname in _GIT_HOSTS:
+        return True
+    _, _, parent = hostname.partition(".")
+    return parent in _GIT_HOSTS
+
+
+def _is_domain(target: str) -> bool:
+    host, colon, port = target.partition(":")
+    try:
+        ascii_host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        return False
+    return _DOMAIN_RE.match(ascii_host + colon + port) is not None
+
+
+def infer_target_type(target: str) -> Target:
     if not target or not isinstance(target, str):
         raise ValueError("Target must be a non-empty string")
 
@@ -346,28 +456,26 @@ def infer_target_type(target: str) -> tuple[str, dict[str, str]]:
 
     parsed = urlparse(target)
     if parsed.scheme in ("http", "https"):
-        if any(
-            host in parsed.netloc.lower() for host in ["github.com", "gitlab.com", "bitbucket.org"]
-        ):
-            return "repository", {"target_repo": target}
-        return "web_application", {"target_url": target}
+        if _is_git_host(parsed.hostname):
+            return Target("repository", target)
+        return Target("web_application", target)
 
-    path = Path(target)
     try:
-        if path.exists():
-            if path.is_dir():
-                return "local_code", {"target_path": str(path.absolute())}
-            raise ValueError(f"Path exists but is not a directory: {target}")
-    except (OSError, RuntimeError) as e:
+        st = os.stat(target)  # noqa: PTH116
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    except OSError as e:
         raise ValueError(f"Invalid path: {target} - {e!s}") from e
+    else:
+        if stat.S_ISDIR(st.st_mode):
+            return Target("local_code", str(Path(target).absolute()))
+        raise ValueError(f"Path exists but is not a directory: {target}")
 
     if target.startswith("git@") or target.endswith(".git"):
-        return "repository", {"target_repo": target}
+        return Target("repository", target)
 
-    if "." in target and "/" not in target and not target.startswith("."):
-        parts = target.split(".")
-        if len(parts) >= 2 and all(p and p.strip() for p in parts):
-            return "web_application", {"target_url": f"https://{target}"}
+    if _is_domain(target):
+        return Target("web_application", f"https://{target}")
 
     raise ValueError(
         f"Invalid target: {target}\n"
@@ -379,11 +487,7 @@ def infer_target_type(target: str) -> tuple[str, dict[str, str]]:
     )
 
 
-def parse_arguments() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(
-        description="Strix Multi-Agent Cybersecurity Scanner",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_PARSER_EPILOG = """
 Examples:
   # Web application scan
   strix --target https://example.com
@@ -400,7 +504,14 @@ Examples:
 
   # Custom instructions
   strix --target example.com --instruction "Focus on authentication vulnerabilities"
-        """,
+"""
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Strix Multi-Agent Cybersecurity Scanner",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_PARSER_EPILOG,
     )
 
     parser.add_argument(
@@ -426,17 +537,25 @@ Examples:
         help="Custom name for this scan run",
     )
 
+    parser.add_argument(
+        "--full-clone",
+        action="store_true",
+        help="Clone the full history of a repository target instead of a shallow clone",
+    )
+
     args = parser.parse_args()
 
     try:
-        args.target_type, args.target_dict = infer_target_type(args.target)
+        args.target_obj = infer_target_type(args.target)
     except ValueError as e:
         parser.error(str(e))
 
     return args
 
 
-def _build_stats_text(tracer: Any) -> Text:
+def _build_stats_text(tracer: Any) -> "Text":
+    from rich.text import Text
+
     stats_text = Text()
     if not tracer:
         return stats_text
@@ -459,7 +578,9 @@ def _build_stats_text(tracer: Any) -> Text:
     return stats_text
 
 
-def _build_llm_stats_text(tracer: Any) -> Text:
+def _build_llm_stats_text(tracer: Any) -> "Text":
+    from rich.text import Text
+
     llm_stats_text = Text()
     if not tracer:
         return llm_stats_text
@@ -491,10 +612,13 @@ def _build_llm_stats_text(tracer: Any) -> Text:
 
 
 def display_completion_message(args: argparse.Namespace, results_path: Path) -> None:
-    console = Console()
+    from rich.panel import Panel
+    from rich.text import Text
+
+    console = _console()
     tracer = get_global_tracer()
 
-    target_value = next(iter(args.target_dict.values())) if args.target_dict else args.target
+    target_value = args.target_obj.value
 
     completion_text = Text()
     completion_text.append("🦉 ", style="bold white")
@@ -551,61 +675,71 @@ def display_completion_message(args: argparse.Namespace, results_path: Path) ->
     console.print()
 
 
+@functools.lru_cache(maxsize=1)
+def _docker_client() -> Any:
+    import docker
+
+    return docker.from_env()
+
+
 def _check_docker_connection() -> Any:
+    from docker.errors import DockerException
+
     try:
-        return docker.from_env()
-    except DockerException:
-        console = Console()
-        error_text = Text()
-        error_text.append("❌ ", style="bold red")
-        error_text.append("DOCKER NOT AVAILABLE", style="bold red")
-        error_text.append("\n\n", style="white")
-        error_text.append("Cannot connect to Docker daemon.\n", style="white")
-        error_text.append("Please ensure Docker is installed and running.\n\n", style="white")
-        error_text.append("Try running: ", style="dim white")
-        error_text.append("sudo systemctl start docker", style="dim cyan")
-
-        panel = Panel(
-            error_text,
-            title="[bold red]🛡️  STRIX STARTUP ERROR",
-            title_align="center",
-            border_style="red",
-            padding=(1, 2),
-        )
-        console.print("\n", panel, "\n")
-        sys.exit(1)
+        return _docker_client()
+    except DockerException as e:
+        raise _StartupError(
+            "STRIX STARTUP ERROR",
+            "DOCKER NOT AVAILABLE",
+            [
+                ("Cannot connect to Docker daemon.\n", "white"),
+                ("Please ensure Docker is installed and running.\n\n", "white"),
+                ("Try running: ", "dim white"),
+                ("sudo systemctl start docker", "dim cyan"),
+            ],
+        ) from e
 
 
 def _image_exists(client: Any) -> bool:
-    try:
-        client.images.get(STRIX_IMAGE)
-    except docker.errors.ImageNotFound:
-        return False
-    else:
-        return True
+    from strix.runtime.docker_runtime import STRIX_IMAGE
+
+    return bool(client.images.list(name=STRIX_IMAGE))
 
 
-def _update_layer_status(layers_info: dict[str, str], layer_id: str, layer_status: str) -> None:
-    if "Pull complete" in layer_status or "Already exists" in layer_status:
+_LAYER_DONE_STATUSES = ("Pull complete", "Already exists")
+
+
+def _update_layer_status(
+    layers_info: dict[str, str], completed_layers: set[str], layer_id: str, layer_status: str
+) -> None:
+    if layer_status.startswith(_LAYER_DONE_STATUSES):
         layers_info[layer_id] = "✓"
-    elif "Downloading" in layer_status:
+        completed_layers.add(layer_id)
+        return
+
+    completed_layers.discard(layer_id)
+    if layer_status.startswith("Downloading"):
         layers_info[layer_id] = "↓"
-    elif "Extracting" in layer_status:
+    elif layer_status.startswith("Extracting"):
         layers_info[layer_id] = "📦"
-    elif "Waiting" in layer_status:
+    elif layer_status.startswith("Waiting"):
         layers_info[layer_id] = "⏳"
     else:
         layers_info[layer_id] = "•"
 
 
 def _process_pull_line(
-    line: dict[str, Any], layers_info: dict[str, str], status: Any, last_update: str
+    line: dict[str, Any],
+    layers_info: dict[str, str],
+    completed_layers: set[str],
+    status: Any,
+    last_update: str,
 ) -> str:
     if "id" in line and "status" in line:
         layer_id = line["id"]
-        _update_layer_status(layers_info, layer_id, line["status"])
+        _update_layer_status(layers_info, completed_layers, layer_id, line["status"])
 
-        completed = sum(1 for v in layers_info.values() if v == "✓")
+        completed = len(completed_layers)
         total = len(layers_info)
 
         if total > 0:
@@ -626,8 +760,16 @@ def _process_pull_line(
     return last_update
 
 
-def pull_docker_image() -> None:
-    console = Console()
+def pull_docker_image(cancelled: threading.Event | None = None) -> None:
+    from docker.errors import DockerException
+    from rich.text import Text
+
+    from strix.runtime.docker_runtime import STRIX_IMAGE
+
+    if _env_snapshot()["STRIX_SKIP_DOCKER_PULL"]:
+        return
+
+    console = _console()
     client = _check_docker_connection()
 
     if _image_exists(client):
@@ -641,29 +783,22 @@ def pull_docker_image() -> None:
     with console.status("[bold cyan]Downloading image layers...", spinner="dots") as status:
         try:
             layers_info: dict[str, str] = {}
+            completed_layers: set[str] = set()
             last_update = ""
 
             for line in client.api.pull(STRIX_IMAGE, stream=True, decode=True):
-                last_update = _process_pull_line(line, layers_info, status, last_update)
+                if cancelled is not None and cancelled.is_set():
+                    return
+                last_update = _process_pull_line(
+                    line, layers_info, completed_layers, status, last_update
+                )
 
         except DockerException as e:
-            console.print()
-            error_text = Text()
-            error_text.append("❌ ", style="bold red")
-            error_text.append("FAILED TO PULL IMAGE", style="bold red")
-            error_text.append("\n\n", style="white")
-            error_text.append(f"Could not download: {STRIX_IMAGE}\n", style="white")
-            error_text.append(str(e), style="dim red")
-
-            panel = Panel(
-                error_text,
-                title="[bold red]🛡️  DOCKER PULL ERROR",
-                title_align="center",
-                border_style="red",
-                padding=(1, 2),
-            )
-            console.print(panel, "\n")
-            sys.exit(1)
+            raise _StartupError(
+                "DOCKER PULL ERROR",
+                "FAILED TO PULL IMAGE",
+                [(f"Could not download: {STRIX_IMAGE}\n", "white"), (str(e), "dim red")],
+            ) from e
 
     success_text = Text()
     success_text.append("✅ ", style="bold green")
@@ -672,26 +807,55 @@ def pull_docker_image() -> None:
     console.print()
 
 
+async def _prepare_runtime() -> None:
+    pull_cancelled = threading.Event()
+    pull = asyncio.create_task(asyncio.to_thread(pull_docker_image, pull_cancelled))
+    warm_up = asyncio.create_task(warm_up_llm())
+
+    done, pending = await asyncio.wait((pull, warm_up), return_when=asyncio.FIRST_EXCEPTION)
+    if not pending:
+        await asyncio.gather(pull, warm_up)
+        return
+
+    # One side failed: stop the other instead of waiting for it. The pull thread checks the
+    # event between progress lines and must finish before asyncio.run closes the executor.
+    pull_cancelled.set()
+    warm_up.cancel()
+    await asyncio.gather(pull, warm_up, return_exceptions=True)
+    for task in done:
+        error = task.exception()
+        if error is not None:
+            raise error
+
+
 def main() -> None:
+    logging.basicConfig(level=logging.ERROR, format="%(message)s")
+
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
     args = parse_arguments()
 
     check_docker_installed()
-    pull_docker_image()
-
+    if args.target_obj.kind == "repository":
+        check_git_installed()
     validate_environment()
-    asyncio.run(warm_up_llm())
+    try:
+        asyncio.run(_prepare_runtime())
+    except _StartupError as e:
+        e.print_panel()
+        sys.exit(1)
 
     if not args.run_name:
         args.run_name = generate_run_name()
 
-    if args.target_type == "repository":
-        repo_url = args.target_dict["target_repo"]
-        cloned_path = clone_repository(repo_url, args.run_name)
+    if args.target_obj.kind == "repository":
+        cloned_path = clone_repository(
+            args.target_obj.value, args.run_name, full_clone=args.full_clone
+        )
+        args.target_obj = replace(args.target_obj, cloned_repo_path=cloned_path)
 
-        args.target_dict["cloned_repo_path"] = cloned_path
+    from strix.cli.app import run_strix_cli
 
     asyncio.run(run_strix_cli(args))
 
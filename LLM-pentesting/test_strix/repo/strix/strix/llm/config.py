@@ -1,19 +1,27 @@
 import os
+from collections.abc import Sequence
+
+
+_DEFAULT_MODEL = os.getenv("STRIX_LLM", "openai/gpt-5")
 
 
 class LLMConfig:
+    __slots__ = ("enable_prompt_caching", "model_name", "prompt_modules", "temperature")
+
     def __init__(
         self,
         model_name: str | None = None,
         temperature: float = 0,
         enable_prompt_caching: bool = True,
-        prompt_modules: list[str] | None = None,
+        prompt_modules: Sequence[str] | None = None,
     ):
-        self.model_name = model_name or os.getenv("STRIX_LLM", "openai/gpt-5")
+        self.model_name = model_name or _DEFAULT_MODEL
 
         if not self.model_name:
             raise ValueError("STRIX_LLM environment variable must be set and not empty")
 
-        self.temperature = max(0.0, min(1.0, temperature))
+        self.temperature = (
+            0.0 if temperature < 0.0 else 1.0 if temperature > 1.0 else float(temperature)
+        )
         self.enable_prompt_caching = enable_prompt_caching
-        self.prompt_modules = prompt_modules or []
+        self.prompt_modules: Sequence[str] = prompt_modules or ()
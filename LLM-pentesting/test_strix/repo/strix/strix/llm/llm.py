@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 import os
 from dataclasses import dataclass
@@ -14,7 +16,7 @@ from jinja2 import (
 from litellm import ModelResponse, completion_cost
 from litellm.utils import supports_prompt_caching
 
-from strix.llm.config import LLMConfig
+from strix.llm.config import _DEFAULT_MODEL, LLMConfig
 from strix.llm.memory_compressor import MemoryCompressor
 from strix.llm.request_queue import get_global_queue
 from strix.llm.utils import _truncate_to_first_function, parse_tool_invocations
@@ -78,6 +80,102 @@ REASONING_EFFORT_SUPPORTED_MODELS = [
     "gemini-2.5-pro",
 ]
 
+_MODELS_WITHOUT_STOP_WORDS = frozenset(model.lower() for model in MODELS_WITHOUT_STOP_WORDS)
+_REASONING_EFFORT_SUPPORTED_MODELS = frozenset(
+    model.lower() for model in REASONING_EFFORT_SUPPORTED_MODELS
+)
+
+
+_CACHE_INTERVAL_STEP = 10
+_EPHEMERAL_CACHE_CONTROL: dict[str, str] = {"type": "ephemeral"}
+_MAX_CACHED_MESSAGES = 3
+
+_COMPRESS_IN_THREAD_MIN_MESSAGES = 64
+_PARSE_IN_THREAD_MIN_CHARS = 16_384
+
+
+@dataclass(frozen=True, slots=True)
+class _ModelCapabilities:
+    include_stop: bool
+    include_reasoning_effort: bool
+    is_anthropic: bool
+    cache_supported: bool
+
+
+@functools.lru_cache(maxsize=16)
+def _model_capabilities(model_name: str) -> _ModelCapabilities:
+    model_name_lower = model_name.lower()
+    actual_model_name = model_name_lower.rsplit("/", 1)[-1]
+    return _ModelCapabilities(
+        include_stop=actual_model_name not in _MODELS_WITHOUT_STOP_WORDS,
+        include_reasoning_effort=actual_model_name in _REASONING_EFFORT_SUPPORTED_MODELS,
+        is_anthropic="anthropic/" in model_name_lower or "claude" in model_name_lower,
+        cache_supported=supports_prompt_caching(model_name),
+    )
+
+
+if _DEFAULT_MODEL:
+    _model_capabilities(_DEFAULT_MODEL)
+
+
+_DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant."
+
+
+@functools.lru_cache(maxsize=16)
+def _get_jinja_env(agent_name: str) -> Environment:
+    prompt_dir = Path(__file__).parent.parent / "agents" / agent_name
+    prompts_dir = Path(__file__).parent.parent / "prompts"
+
+    return Environment(
+        loader=FileSystemLoader([prompt_dir, prompts_dir]),
+        autoescape=select_autoescape(enabled_extensions=(), default_for_string=False),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _build_system_prompt(agent_name: str, prompt_modules: tuple[str, ...]) -> str:
+    jinja_env = _get_jinja_env(agent_name)
+    prompt_module_content = load_prompt_modules(prompt_modules, jinja_env)
+
+    def get_module(name: str) -> str:
+        return prompt_module_content.get(name, "")
+
+    return jinja_env.get_template("system_prompt.jinja").render(
+        get_module=get_module,
+        get_tools_prompt=get_tools_prompt,
+        loaded_module_names=list(prompt_module_content.keys()),
+        **prompt_module_content,
+    )
+
+
+_REQUEST_ERROR_MESSAGES: tuple[tuple[type[Exception], str], ...] = (
+    (litellm.RateLimitError, "Rate limit exceeded"),
+    (litellm.AuthenticationError, "Invalid API key"),
+    (litellm.NotFoundError, "Model not found"),
+    (litellm.ContextWindowExceededError, "Context too long"),
+    (litellm.ContentPolicyViolationError, "Content policy violation"),
+    (litellm.ServiceUnavailableError, "Service unavailable"),
+    (litellm.Timeout, "Request timed out"),
+    (litellm.UnprocessableEntityError, "Unprocessable entity"),
+    (litellm.InternalServerError, "Internal server error"),
+    (litellm.APIConnectionError, "Connection error"),
+    (litellm.UnsupportedParamsError, "Unsupported parameters"),
+    (litellm.BudgetExceededError, "Budget exceeded"),
+    (litellm.APIResponseValidationError, "Response validation error"),
+    (litellm.JSONSchemaValidationError, "JSON schema validation error"),
+    (litellm.InvalidRequestError, "Invalid request"),
+    (litellm.BadRequestError, "Bad request"),
+    (litellm.APIError, "API error"),
+    (litellm.OpenAIError, "OpenAI error"),
+)
+
+
+def _request_error_message(error_type: type[Exception]) -> str:
+    for exception_type, message in _REQUEST_ERROR_MESSAGES:
+        if issubclass(error_type, exception_type):
+            return message
+    return error_type.__name__
+
 
 class StepRole(str, Enum):
     AGENT = "agent"
@@ -85,7 +183,7 @@ class StepRole(str, Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     content: str
     tool_invocations: list[dict[str, Any]] | None = None
@@ -94,7 +192,7 @@ class LLMResponse:
     role: StepRole = StepRole.AGENT
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestStats:
     input_tokens: int = 0
     output_tokens: int = 0
@@ -126,116 +224,104 @@ class LLM:
         self.memory_compressor = MemoryCompressor()
 
         if agent_name:
-            prompt_dir = Path(__file__).parent.parent / "agents" / agent_name
-            prompts_dir = Path(__file__).parent.parent / "prompts"
-
-            loader = FileSystemLoader([prompt_dir, prompts_dir])
-            self.jinja_env = Environment(
-                loader=loader,
-                autoescape=select_autoescape(enabled_extensions=(), default_for_string=False),
-            )
-
-            try:
-                prompt_module_content = load_prompt_modules(
-                    self.config.prompt_modules or [], self.jinja_env
-                )
+            self.jinja_env = _get_jinja_env(agent_name)
+
+        capabilities = _model_capabilities(self.config.model_name)
+        self._include_stop = capabilities.include_stop
+        self._include_reasoning_effort = capabilities.include_reasoning_effort
+        self._cache_supported = capabilities.cache_supported
+        self._cache_enabled = (
+            self.config.enable_prompt_caching
+            and capabilities.cache_supported
+            and capabilities.is_anthropic
+        )
+        self._cached_overlay: dict[int, tuple[dict[str, Any], str, dict[str, Any]]] = {}
 
-                def get_module(name: str) -> str:
-                    return prompt_module_content.get(name, "")
+    @functools.cached_property
+    def system_prompt(self) -> str:
+        if not self.agent_name:
+            return _DEFAULT_SYSTEM_PROMPT
 
-                self.jinja_env.globals["get_module"] = get_module
+        try:
+            return _build_system_prompt(self.agent_name, tuple(self.config.prompt_modules))
+        except (FileNotFoundError, OSError, ValueError) as e:
+            logger.warning(f"Failed to load system prompt for {self.agent_name}: {e}")
+            return _DEFAULT_SYSTEM_PROMPT
 
-                self.system_prompt = self.jinja_env.get_template("system_prompt.jinja").render(
-                    get_tools_prompt=get_tools_prompt,
-                    loaded_module_names=list(prompt_module_content.keys()),
-                    **prompt_module_content,
-                )
-            except (FileNotFoundError, OSError, ValueError) as e:
-                logger.warning(f"Failed to load system prompt for {agent_name}: {e}")
-                self.system_prompt = "You are a helpful AI assistant."
-        else:
-            self.system_prompt = "You are a helpful AI assistant."
+    @functools.cached_property
+    def _system_message(self) -> dict[str, Any]:
+        return {"role": "system", "content": self.system_prompt}
 
     def _add_cache_control_to_content(
         self, content: str | list[dict[str, Any]]
     ) -> str | list[dict[str, Any]]:
         if isinstance(content, str):
-            return [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
+            return [{"type": "text", "text": content, "cache_control": _EPHEMERAL_CACHE_CONTROL}]
         if isinstance(content, list) and content:
             last_item = content[-1]
             if isinstance(last_item, dict) and last_item.get("type") == "text":
-                return content[:-1] + [{**last_item, "cache_control": {"type": "ephemeral"}}]
+                cached_content = content.copy()
+                cached_content[-1] = {**last_item, "cache_control": _EPHEMERAL_CACHE_CONTROL}
+                return cached_content
         return content
 
-    def _is_anthropic_model(self) -> bool:
-        if not self.config.model_name:
-            return False
-        model_lower = self.config.model_name.lower()
-        return any(provider in model_lower for provider in ["anthropic/", "claude"])
-
     def _calculate_cache_interval(self, total_messages: int) -> int:
         if total_messages <= 1:
-            return 10
+            return _CACHE_INTERVAL_STEP
 
-        max_cached_messages = 3
         non_system_messages = total_messages - 1
-
-        interval = 10
-        while non_system_messages // interval > max_cached_messages:
-            interval += 10
-
-        return interval
+        step_span = _CACHE_INTERVAL_STEP * (_MAX_CACHED_MESSAGES + 1)
+        return _CACHE_INTERVAL_STEP * (non_system_messages // step_span + 1)
 
     def _prepare_cached_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        if (
-            not self.config.enable_prompt_caching
-            or not supports_prompt_caching(self.config.model_name)
-            or not messages
-        ):
+        if not self._cache_enabled or not messages:
             return messages
 
-        if not self._is_anthropic_model():
-            return messages
+        previous_overlay = self._cached_overlay
+        overlay: dict[int, tuple[dict[str, Any], str, dict[str, Any]]] = {}
 
-        cached_messages = list(messages)
+        def annotate(i: int) -> None:
+            message = messages[i]
+            content = message["content"]
+            entry = previous_overlay.get(i)
+            if entry is not None and entry[0] is message and entry[1] is content:
+                annotated = entry[2]
+            else:
+                annotated = message.copy()
+                annotated["content"] = self._add_cache_control_to_content(content)
+            if isinstance(content, str):
+                overlay[i] = (message, content, annotated)
+            messages[i] = annotated
 
-        if cached_messages and cached_messages[0].get("role") == "system":
-            system_message = cached_messages[0].copy()
-            system_message["content"] = self._add_cache_control_to_content(
-                system_message["content"]
-            )
-            cached_messages[0] = system_message
+        if messages[0].get("role") == "system":
+            annotate(0)
 
-        total_messages = len(cached_messages)
+        total_messages = len(messages)
         if total_messages > 1:
             interval = self._calculate_cache_interval(total_messages)
 
-            cached_count = 0
-            for i in range(interval, total_messages, interval):
-                if cached_count >= 3:
-                    break
+            for i in range(interval, total_messages, interval)[:_MAX_CACHED_MESSAGES]:
+                annotate(i)
 
-                if i < len(cached_messages):
-                    message = cached_messages[i].copy()
-                    message["content"] = self._add_cache_control_to_content(message["content"])
-                    cached_messages[i] = message
-                    cached_count += 1
+        self._cached_overlay = overlay
+        return messages
 
-        return cached_messages
-
-    async def generate(  # noqa: PLR0912, PLR0915
+    async def generate(
         self,
         conversation_history: list[dict[str, Any]],
         scan_id: str | None = None,
         step_number: int = 1,
     ) -> LLMResponse:
-        messages = [{"role": "system", "content": self.system_prompt}]
-
-        compressed_history = list(self.memory_compressor.compress_history(conversation_history))
+        if len(conversation_history) > _COMPRESS_IN_THREAD_MIN_MESSAGES:
+            compressed_history = await asyncio.to_thread(
+                self.memory_compressor.compress_history, conversation_history
+            )
+        else:
+            compressed_history = self.memory_compressor.compress_history(conversation_history)
+        if compressed_history is not conversation_history:
+            conversation_history[:] = compressed_history
 
-        conversation_history.clear()
-        conversation_history.extend(compressed_history)
-        messages.extend(compressed_history)
+        messages = [self._system_message, *conversation_history]
 
         cached_messages = self._prepare_cached_messages(messages)
 
@@ -251,13 +337,15 @@ class LLM:
             ):
                 content = getattr(response.choices[0].message, "content", "") or ""
 
+            function_end_index = content.find("</function>")
+            if function_end_index != -1:
+                content = content[: function_end_index + len("</function>")]
             content = _truncate_to_first_function(content)
 
-            if "</function>" in content:
-                function_end_index = content.find("</function>") + len("</function>")
-                content = content[:function_end_index]
-
-            tool_invocations = parse_tool_invocations(content)
+            if len(content) > _PARSE_IN_THREAD_MIN_CHARS:
+                tool_invocations = await asyncio.to_thread(parse_tool_invocations, content)
+            else:
+                tool_invocations = parse_tool_invocations(content)
 
             return LLMResponse(
                 scan_id=scan_id,
@@ -267,50 +355,9 @@ class LLM:
                 tool_invocations=tool_invocations if tool_invocations else None,
             )
 
-        except litellm.RateLimitError as e:
-            raise LLMRequestFailedError("LLM request failed: Rate limit exceeded", str(e)) from e
-        except litellm.AuthenticationError as e:
-            raise LLMRequestFailedError("LLM request failed: Invalid API key", str(e)) from e
-        except litellm.NotFoundError as e:
-            raise LLMRequestFailedError("LLM request failed: Model not found", str(e)) from e
-        except litellm.ContextWindowExceededError as e:
-            raise LLMRequestFailedError("LLM request failed: Context too long", str(e)) from e
-        except litellm.ContentPolicyViolationError as e:
-            raise LLMRequestFailedError(
-                "LLM request failed: Content policy violation", str(e)
-            ) from e
-        except litellm.ServiceUnavailableError as e:
-            raise LLMRequestFailedError("LLM request failed: Service unavailable", str(e)) from e
-        except litellm.Timeout as e:
-            raise LLMRequestFailedError("LLM request failed: Request timed out", str(e)) from e
-        except litellm.UnprocessableEntityError as e:
-            raise LLMRequestFailedError("LLM request failed: Unprocessable entity", str(e)) from e
-        except litellm.InternalServerError as e:
-            raise LLMRequestFailedError("LLM request failed: Internal server error", str(e)) from e
-        except litellm.APIConnectionError as e:
-            raise LLMRequestFailedError("LLM request failed: Connection error", str(e)) from e
-        except litellm.UnsupportedParamsError as e:
-            raise LLMRequestFailedError("LLM request failed: Unsupported parameters", str(e)) from e
-        except litellm.BudgetExceededError as e:
-            raise LLMRequestFailedError("LLM request failed: Budget exceeded", str(e)) from e
-        except litellm.APIResponseValidationError as e:
-            raise LLMRequestFailedError(
-                "LLM request failed: Response validation error", str(e)
-            ) from e
-        except litellm.JSONSchemaValidationError as e:
-            raise LLMRequestFailedError(
-                "LLM request failed: JSON schema validation error", str(e)
-            ) from e
-        except litellm.InvalidRequestError as e:
-            raise LLMRequestFailedError("LLM request failed: Invalid request", str(e)) from e
-        except litellm.BadRequestError as e:
-            raise LLMRequestFailedError("LLM request failed: Bad request", str(e)) from e
-        except litellm.APIError as e:
-            raise LLMRequestFailedError("LLM request failed: API error", str(e)) from e
-        except litellm.OpenAIError as e:
-            raise LLMRequestFailedError("LLM request failed: OpenAI error", str(e)) from e
         except Exception as e:
-            raise LLMRequestFailedError(f"LLM request failed: {type(e).__name__}", str(e)) from e
+            message = _request_error_message(type(e))
+            raise LLMRequestFailedError(f"LLM request failed: {message}", str(e)) from e
 
     @property
     def usage_stats(self) -> dict[str, dict[str, int | float]]:
@@ -322,35 +369,9 @@ class LLM:
     def get_cache_config(self) -> dict[str, bool]:
         return {
             "enabled": self.config.enable_prompt_caching,
-            "supported": supports_prompt_caching(self.config.model_name),
+            "supported": self._cache_supported,
         }
 
-    def _should_include_stop_param(self) -> bool:
-        if not self.config.model_name:
-            return True
-
-        actual_model_name = self.config.model_name.split("/")[-1].lower()
-        model_name_lower = self.config.model_name.lower()
-
-        return not any(
-            actual_model_name == unsupported_model.lower()
-            or model_name_lower == unsupported_model.lower()
-            for unsupported_model in MODELS_WITHOUT_STOP_WORDS
-        )
-
-    def _should_include_reasoning_effort(self) -> bool:
-        if not self.config.model_name:
-            return False
-
-        actual_model_name = self.config.model_name.split("/")[-1].lower()
-        model_name_lower = self.config.model_name.lower()
-
-        return any(
-            actual_model_name == supported_model.lower()
-            or model_name_lower == supported_model.lower()
-            for supported_model in REASONING_EFFORT_SUPPORTED_MODELS
-        )
-
     async def _make_request(
         self,
         messages: list[dict[str, Any]],
@@ -362,10 +383,10 @@ class LLM:
             "timeout": 180,
         }
 
-        if self._should_include_stop_param():
+        if self._include_stop:
             completion_args["stop"] = ["</function>"]
 
-        if self._should_include_reasoning_effort():
+        if self._include_reasoning_effort:
             completion_args["reasoning_effort"] = "high"
 
         queue = get_global_queue()
@@ -378,26 +399,15 @@ class LLM:
 
     def _update_usage_stats(self, response: ModelResponse) -> None:
         try:
-            if hasattr(response, "usage") and response.usage:
-                input_tokens = getattr(response.usage, "prompt_tokens", 0)
-                output_tokens = getattr(response.usage, "completion_tokens", 0)
-
-                cached_tokens = 0
-                cache_creation_tokens = 0
-
-                if hasattr(response.usage, "prompt_tokens_details"):
-                    prompt_details = response.usage.prompt_tokens_details
-                    if hasattr(prompt_details, "cached_tokens"):
-                        cached_tokens = prompt_details.cached_tokens or 0
-
-                if hasattr(response.usage, "cache_creation_input_tokens"):
-                    cache_creation_tokens = response.usage.cache_creation_input_tokens or 0
-
+            usage = getattr(response, "usage", None)
+            if usage:
+                input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+                output_tokens = getattr(usage, "completion_tokens", 0) or 0
+                prompt_details = getattr(usage, "prompt_tokens_details", None)
+                cached_tokens = getattr(prompt_details, "cached_tokens", 0) or 0
+                cache_creation_tokens = getattr(usage, "cache_creation_input_tokens", 0) or 0
             else:
-                input_tokens = 0
-                output_tokens = 0
-                cached_tokens = 0
-                cache_creation_tokens = 0
+                input_tokens = output_tokens = cached_tokens = cache_creation_tokens = 0
 
             try:
                 cost = completion_cost(response) or 0.0
@@ -418,10 +428,13 @@ class LLM:
             self._last_request_stats.cost = cost
 
             if cached_tokens > 0:
-                logger.info(f"Cache hit: {cached_tokens} cached tokens, {input_tokens} new tokens")
+                logger.info(
+                    "Cache hit: %s cached tokens, %s new tokens", cached_tokens, input_tokens
+                )
             if cache_creation_tokens > 0:
-                logger.info(f"Cache creation: {cache_creation_tokens} tokens written to cache")
+                logger.info("Cache creation: %s tokens written to cache", cache_creation_tokens)
 
-            logger.info(f"Usage stats: {self.usage_stats}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Usage stats: %s", self.usage_stats)
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Failed to update usage stats: {e}")
@@ -153,6 +153,26 @@ class MemoryCompressor:
         if not self.model_name:
             raise ValueError("STRIX_LLM environment variable must be set and not empty")
 
+        self._token_counts: dict[int, tuple[str, int]] = {}
+
+    def _count_history_tokens(self, messages: list[dict[str, Any]], model: str) -> int:
+        # Text contents are immutable, so only messages new since the last call get tokenized.
+        # Entries hold the string itself to keep its id valid and are dropped once it leaves.
+        previous = self._token_counts
+        current: dict[int, tuple[str, int]] = {}
+        total = 0
+        for msg in messages:
+            content = msg.get("content", "")
+            if not isinstance(content, str):
+                total += _get_message_tokens(msg, model)
+                continue
+            cached = previous.get(id(content))
+            tokens = cached[1] if cached is not None else _count_tokens(content, model)
+            current[id(content)] = (content, tokens)
+            total += tokens
+        self._token_counts = current
+        return total
+
     def compress_history(
         self,
         messages: list[dict[str, Any]],
@@ -191,9 +211,7 @@ class MemoryCompressor:
         # Type assertion since we ensure model_name is not None in __init__
         model_name: str = self.model_name  # type: ignore[assignment]
 
-        total_tokens = sum(
-            _get_message_tokens(msg, model_name) for msg in system_msgs + regular_msgs
-        )
+        total_tokens = self._count_history_tokens(messages, model_name)
 
         if total_tokens <= MAX_TOTAL_TOKENS * 0.9:
             return messages
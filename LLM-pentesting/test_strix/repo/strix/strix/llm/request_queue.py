@@ -34,10 +34,10 @@ class LLMRequestQueue:
         self._lock = threading.Lock()
 
     async def make_request(self, completion_args: dict[str, Any]) -> ModelResponse:
-        try:
-            while not self._semaphore.acquire(timeout=0.2):
-                await asyncio.sleep(0.1)
+        return await asyncio.to_thread(self._throttled_request, completion_args)
 
+    def _throttled_request(self, completion_args: dict[str, Any]) -> ModelResponse:
+        with self._semaphore:
             with self._lock:
                 now = time.time()
                 time_since_last = now - self._last_request_time
@@ -45,11 +45,9 @@ class LLMRequestQueue:
                 self._last_request_time = now + sleep_needed
 
             if sleep_needed > 0:
-                await asyncio.sleep(sleep_needed)
+                time.sleep(sleep_needed)
 
-            return await self._reliable_request(completion_args)
-        finally:
-            self._semaphore.release()
+            return self._reliable_request(completion_args)
 
     @retry(  # type: ignore[misc]
         stop=stop_after_attempt(5),
@@ -57,7 +55,7 @@ class LLMRequestQueue:
         retry=retry_if_exception(should_retry_exception),
         reraise=True,
     )
-    async def _reliable_request(self, completion_args: dict[str, Any]) -> ModelResponse:
+    def _reliable_request(self, completion_args: dict[str, Any]) -> ModelResponse:
         response = completion(**completion_args, stream=False)
         if isinstance(response, ModelResponse):
             return response
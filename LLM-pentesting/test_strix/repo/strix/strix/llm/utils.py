@@ -3,18 +3,31 @@ import re
 from typing import Any
 
 
+_FUNCTION_RE = re.compile(r"<function=([^>]+)>\n?(.*?)</function>", re.DOTALL)
+_PARAMETER_RE = re.compile(r"<parameter=([^>]+)>(.*?)</parameter>", re.DOTALL)
+_TOOL_CALL_RE = re.compile(r"<function=[^>]+>.*?</function>", re.DOTALL)
+_HIDDEN_XML_RES = (
+    re.compile(r"<inter_agent_message>.*?</inter_agent_message>", re.DOTALL | re.IGNORECASE),
+    re.compile(
+        r"<agent_completion_report>.*?</agent_completion_report>", re.DOTALL | re.IGNORECASE
+    ),
+)
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
+
 def _truncate_to_first_function(content: str) -> str:
     if not content:
         return content
 
-    function_starts = [match.start() for match in re.finditer(r"<function=", content)]
-
-    if len(function_starts) >= 2:
-        second_function_start = function_starts[1]
+    first_function_start = content.find("<function=")
+    if first_function_start == -1:
+        return content
 
-        return content[:second_function_start].rstrip()
+    second_function_start = content.find("<function=", first_function_start + 1)
+    if second_function_start == -1:
+        return content
 
-    return content
+    return content[:second_function_start].rstrip()
 
 
 def parse_tool_invocations(content: str) -> list[dict[str, Any]] | None:
@@ -22,23 +35,17 @@ def parse_tool_invocations(content: str) -> list[dict[str, Any]] | None:
 
     tool_invocations: list[dict[str, Any]] = []
 
-    fn_regex_pattern = r"<function=([^>]+)>\n?(.*?)</function>"
-    fn_param_regex_pattern = r"<parameter=([^>]+)>(.*?)</parameter>"
-
-    fn_matches = re.finditer(fn_regex_pattern, content, re.DOTALL)
-
-    for fn_match in fn_matches:
+    for fn_match in _FUNCTION_RE.finditer(content):
         fn_name = fn_match.group(1)
         fn_body = fn_match.group(2)
 
-        param_matches = re.finditer(fn_param_regex_pattern, fn_body, re.DOTALL)
-
         args = {}
-        for param_match in param_matches:
+        for param_match in _PARAMETER_RE.finditer(fn_body):
             param_name = param_match.group(1)
             param_value = param_match.group(2).strip()
 
-            param_value = html.unescape(param_value)
+            if "&" in param_value:
+                param_value = html.unescape(param_value)
             args[param_name] = param_value
 
         tool_invocations.append({"toolName": fn_name, "args": args})
@@ -47,7 +54,7 @@ def parse_tool_invocations(content: str) -> list[dict[str, Any]] | None:
 
 
 def _fix_stopword(content: str) -> str:
-    if "<function=" in content and content.count("<function=") == 1:
+    if content.count("<function=") == 1:
         if content.endswith("</"):
             content = content.rstrip() + "function>"
         elif not content.rstrip().endswith("</function>"):
@@ -72,16 +79,10 @@ def clean_content(content: str) -> str:
 
     content = _fix_stopword(content)
 
-    tool_pattern = r"<function=[^>]+>.*?</function>"
-    cleaned = re.sub(tool_pattern, "", content, flags=re.DOTALL)
-
-    hidden_xml_patterns = [
-        r"<inter_agent_message>.*?</inter_agent_message>",
-        r"<agent_completion_report>.*?</agent_completion_report>",
-    ]
-    for pattern in hidden_xml_patterns:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.DOTALL | re.IGNORECASE)
+    cleaned = _TOOL_CALL_RE.sub("", content)
+    for pattern in _HIDDEN_XML_RES:
+        cleaned = pattern.sub("", cleaned)
 
-    cleaned = re.sub(r"\n\s*\n", "\n\n", cleaned)
+    cleaned = _BLANK_LINES_RE.sub("\n\n", cleaned)
 
     return cleaned.strip()
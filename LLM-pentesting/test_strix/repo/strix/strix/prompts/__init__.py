@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from pathlib import Path
 
 from jinja2 import Environment
@@ -69,7 +70,7 @@ def generate_modules_description() -> str:
     return description
 
 
-def load_prompt_modules(module_names: list[str], jinja_env: Environment) -> dict[str, str]:
+def load_prompt_modules(module_names: Sequence[str], jinja_env: Environment) -> dict[str, str]:
     import logging
 
     logger = logging.getLogger(__name__)
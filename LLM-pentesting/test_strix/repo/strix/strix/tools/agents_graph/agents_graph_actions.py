@@ -71,7 +71,7 @@ def _run_agent_in_thread(
 
         _agent_states[state.agent_id] = state
 
-        _agent_graph["nodes"][state.agent_id]["state"] = state.model_dump()
+        _agent_graph["nodes"][state.agent_id]["state"] = state.to_dict()
 
         import asyncio
 
@@ -225,10 +225,13 @@ def create_agent(
                 }
 
         from strix.agents import StrixAgent
-        from strix.agents.state import AgentState
+        from strix.agents.state import AgentIdentity, AgentState
         from strix.llm.config import LLMConfig
 
-        state = AgentState(task=task, agent_name=name, parent_id=parent_id, max_iterations=200)
+        state = AgentState(
+            identity=AgentIdentity(agent_name=name, parent_id=parent_id, max_iterations=200),
+            task=task,
+        )
 
         llm_config = LLMConfig(prompt_modules=module_list)
         agent = StrixAgent(
@@ -0,0 +1,91 @@
+import itertools
+import time
+
+import pytest
+
+from strix.agents.state import AgentState
+
+
+@pytest.fixture
+def state(monkeypatch: pytest.MonkeyPatch) -> AgentState:
+    ticks = itertools.count(1_000)
+    monkeypatch.setattr(time, "time_ns", lambda: next(ticks))
+    return AgentState(task="scan example.com", last_updated=0)
+
+
+def test_repeated_request_stop_is_a_no_op(state: AgentState) -> None:
+    state.request_stop()
+    last_updated = state.last_updated
+
+    state.request_stop()
+
+    assert state.stop_requested
+    assert state.last_updated == last_updated
+
+
+def test_repeated_completion_with_same_result_is_a_no_op(state: AgentState) -> None:
+    state.set_completed({"success": True})
+    last_updated = state.last_updated
+
+    state.set_completed({"success": True})
+
+    assert state.completed
+    assert state.last_updated == last_updated
+
+
+def test_completion_with_new_result_updates_state(state: AgentState) -> None:
+    state.set_completed({"success": True})
+    last_updated = state.last_updated
+
+    state.set_completed({"success": False})
+
+    assert state.final_result == {"success": False}
+    assert state.last_updated > last_updated
+
+
+def test_repeated_enter_waiting_state_is_a_no_op(state: AgentState) -> None:
+    state.enter_waiting_state()
+    last_updated = state.last_updated
+
+    state.enter_waiting_state()
+
+    assert state.waiting_for_input
+    assert state.last_updated == last_updated
+
+
+def test_enter_waiting_state_records_llm_failure_change(state: AgentState) -> None:
+    state.enter_waiting_state()
+    last_updated = state.last_updated
+
+    state.enter_waiting_state(llm_failed=True)
+
+    assert state.llm_failed
+    assert state.last_updated > last_updated
+
+
+def test_resume_from_waiting_is_a_no_op_when_already_running(state: AgentState) -> None:
+    last_updated = state.last_updated
+
+    state.resume_from_waiting()
+    state.resume_from_waiting(state.task)
+
+    assert state.last_updated == last_updated
+
+
+def test_resume_from_waiting_applies_new_task(state: AgentState) -> None:
+    last_updated = state.last_updated
+
+    state.resume_from_waiting("scan example.org")
+
+    assert state.task == "scan example.org"
+    assert state.last_updated > last_updated
+
+
+def test_resume_from_waiting_clears_stop_and_completion(state: AgentState) -> None:
+    state.request_stop()
+    state.set_completed()
+
+    state.resume_from_waiting()
+
+    assert not state.stop_requested
+    assert not state.completed
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import pytest
+
+from strix.cli.main import Target, infer_target_type
+
+
+@pytest.mark.parametrize(
+    ("target", "kind"),
+    [
+        ("https://github.com/usestrix/strix", "repository"),
+        ("https://api.github.com/repos/usestrix/strix", "repository"),
+        ("http://gitlab.com/group/project", "repository"),
+        ("git@github.com:usestrix/strix.git", "repository"),
+        ("ssh://git.example.com/project.git", "repository"),
+        ("https://example.com", "web_application"),
+        ("https://github.com.example.com/login", "web_application"),
+    ],
+)
+def test_infer_target_type_urls(target: str, kind: str) -> None:
+    result = infer_target_type(target)
+
+    assert (result.kind, result.value, result.cloned_repo_path) == (kind, target, None)
+
+
+def test_infer_target_type_local_directory(tmp_path: Path) -> None:
+    assert infer_target_type(str(tmp_path)) == Target("local_code", str(tmp_path.absolute()))
+
+
+def test_infer_target_type_rejects_files(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("")
+
+    with pytest.raises(ValueError, match="not a directory"):
+        infer_target_type(str(path))
+
+
+@pytest.mark.parametrize(
+    "domain",
+    [
+        "example.com",
+        "sub.example.co.uk",
+        "EXAMPLE.com",
+        "例え.jp",
+        "bücher.de",
+        "my_host.example.com",
+        "example.com:8080",
+    ],
+)
+def test_infer_target_type_domains(
+    domain: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    assert infer_target_type(f"  {domain} ") == Target("web_application", f"https://{domain}")
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        "localhost",
+        "a..b",
+        ".example.com",
+        "example.com.",
+        "foo bar.com",
+        "example.com:http",
+        "example.com:123456",
+        f"{'x' * 64}.com",
+    ],
+)
+def test_infer_target_type_rejects_invalid_domains(
+    target: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(ValueError, match="Invalid target"):
+        infer_target_type(target)
+
+
+def test_infer_target_type_rejects_empty_target() -> None:
+    with pytest.raises(ValueError, match="non-empty string"):
+        infer_target_type("")
+
+
+@pytest.mark.parametrize(
+    ("target", "local_source_path", "scan_target"),
+    [
+        (
+            Target("repository", "https://github.com/usestrix/strix"),
+            None,
+            {"target_repo": "https://github.com/usestrix/strix"},
+        ),
+        (
+            Target("repository", "https://github.com/usestrix/strix", "/tmp/strix_repos/run"),
+            "/tmp/strix_repos/run",
+            {
+                "target_repo": "https://github.com/usestrix/strix",
+                "cloned_repo_path": "/tmp/strix_repos/run",
+            },
+        ),
+        (
+            Target("web_application", "https://example.com"),
+            None,
+            {"target_url": "https://example.com"},
+        ),
+        (
+            Target("local_code", "/home/user/project"),
+            "/home/user/project",
+            {"target_path": "/home/user/project"},
+        ),
+    ],
+)
+def test_target_local_source_path_and_scan_target(
+    target: Target, local_source_path: str | None, scan_target: dict[str, str]
+) -> None:
+    assert target.local_source_path == local_source_path
+    assert target.to_scan_target() == scan_target
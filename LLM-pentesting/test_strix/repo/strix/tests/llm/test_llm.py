@@ -0,0 +1,38 @@
+import pytest
+
+from strix.llm.config import LLMConfig
+from strix.llm.llm import LLM
+
+
+def _loop_cache_interval(total_messages: int) -> int:
+    if total_messages <= 1:
+        return 10
+
+    max_cached_messages = 3
+    non_system_messages = total_messages - 1
+
+    interval = 10
+    while non_system_messages // interval > max_cached_messages:
+        interval += 10
+
+    return interval
+
+
+@pytest.fixture
+def llm() -> LLM:
+    return LLM(LLMConfig(model_name="anthropic/claude-sonnet-4-20250514"))
+
+
+def test_cache_interval_matches_incremental_search(llm: LLM) -> None:
+    for total_messages in range(-1, 5_000):
+        assert llm._calculate_cache_interval(total_messages) == _loop_cache_interval(
+            total_messages
+        ), total_messages
+
+
+@pytest.mark.parametrize(
+    ("total_messages", "interval"),
+    [(0, 10), (1, 10), (40, 10), (41, 20), (80, 20), (81, 30), (121, 40)],
+)
+def test_cache_interval_boundaries(llm: LLM, total_messages: int, interval: int) -> None:
+    assert llm._calculate_cache_interval(total_messages) == interval